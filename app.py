@@ -1,15 +1,32 @@
 import streamlit as st
-import requests
-import json
+import aiohttp
+import aiofiles
+import asyncio
+import orjson
 import base64
-import pandas as pd
+import hashlib
+import io
+import re
 from datetime import datetime
-from dotenv import load_dotenv
+from PIL import ExifTags, Image, ImageOps
 import os
-import glob
+import sqlite3
+import sys
+from collections import defaultdict
+from contextlib import closing
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (Streamlit reruns the script, so only import dotenv when needed)
+if not os.getenv('HAIKU_API_KEY'):
+    from dotenv import load_dotenv
+    load_dotenv()
+
+# Run the upload pipeline on uvloop where it is available; Windows keeps the default loop.
+# uvloop.run only affects the loop it creates, not Streamlit's own server loop.
+if sys.platform == 'win32':
+    run_async = asyncio.run
+else:
+    import uvloop
+    run_async = uvloop.run
 
 # Configure Streamlit page
 st.set_page_config(page_title="Employee Schedule Scanner", page_icon="📅", layout="wide")
@@ -21,27 +38,89 @@ if not API_KEY:
     st.stop()
 
 API_URL = 'https://api.anthropic.com/v1/messages'
+API_HEADERS = {
+    'anthropic-version': '2023-06-01',
+    'content-type': 'application/json',
+    'x-api-key': API_KEY
+}
+MODEL = 'claude-3-haiku-20240307'
+# Bump when the prompt changes so cached responses are not reused
+PROMPT_VERSION = '4'
+# Largest image the vision API uses without downscaling it server-side:
+# at most 1568px on the long edge and about 1.15 megapixels (~1600 tokens)
+MAX_IMAGE_SIZE = 1568
+MAX_IMAGE_PIXELS = 1_150_000
+WEEKDAYS = frozenset({'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'})
+# Everything from the first "{" to the last "}" of a model reply
+JSON_OBJECT_PATTERN = re.compile(r'\{.*\}', re.DOTALL)
+# A shift such as "9:00 AM - 5:00 PM", "9am-5pm", "09:00 to 17:00" or "9.00-17.00";
+# the lookbehind stops it from starting in the middle of a number
+HOURS_RANGE_PATTERN = re.compile(
+    r'(?<![\d.:])(\d{1,2})(?:[:.](\d{2}))?\s*(?:([ap])\.?m\.?)?'
+    r'\s*(?:-|–|—|to)\s*'
+    r'(\d{1,2})(?:[:.](\d{2}))?\s*(?:([ap])\.?m\.?)?',
+    re.IGNORECASE
+)
+# Characters that str.isalnum() rejects, replaced to build folder names
+NON_ALNUM_PATTERN = re.compile(r'[\W_]')
+LLM_CACHE_DIR = os.path.join(os.getcwd(), "llm_cache")
+INDEX_PATH = os.path.join(os.getcwd(), "schedules", "index.sqlite")
 
-def extract_schedule_data(image_bytes):
-    """First step: Extract raw schedule data from image"""
-    headers = {
-        'anthropic-version': '2023-06-01',
-        'content-type': 'application/json',
-        'x-api-key': API_KEY
-    }
+def downscale_image(image_bytes):
+    """Shrink the image to the API's maximum size and re-encode it as JPEG"""
+    img = Image.open(io.BytesIO(image_bytes))
+    width, height = img.size
+    scale = min(1, MAX_IMAGE_SIZE / max(width, height), (MAX_IMAGE_PIXELS / (width * height)) ** 0.5)
+    orientation = img.getexif().get(ExifTags.Base.Orientation, 1)
+    if img.format == 'JPEG' and scale == 1 and orientation == 1:
+        return image_bytes
     
-    encoded_image = base64.b64encode(image_bytes).decode('utf-8')
+    # Re-encoding drops EXIF, so apply the photo's rotation to the pixels first
+    img = ImageOps.exif_transpose(img)
+    if scale < 1:
+        img.thumbnail((int(img.width * scale), int(img.height * scale)), Image.LANCZOS)
+    buf = io.BytesIO()
+    # JPEG has no alpha channel, so PNG uploads are flattened to RGB
+    img.convert('RGB').save(buf, 'JPEG', quality=85, optimize=True)
+    return buf.getvalue()
+
+def encode_image(cache_key, image_bytes):
+    """Downscale and base64-encode an image, reusing the result when it is retried"""
+    state_key = f"b64_{cache_key}"
+    if state_key not in st.session_state:
+        st.session_state[state_key] = base64.b64encode(downscale_image(image_bytes)).decode('ascii')
+    return st.session_state[state_key]
+
+def parse_json_response(content, output=st):
+    """Parse the JSON object in a model reply, ignoring any surrounding text"""
+    match = JSON_OBJECT_PATTERN.search(content)
+    if not match:
+        output.error("❌ Could not find JSON in response")
+        return None
     
+    try:
+        return orjson.loads(match.group(0))
+    except Exception as e:
+        output.error(f"❌ Error parsing JSON: {str(e)}")
+        return None
+
+async def extract_schedule_data(session, encoded_image, output=st):
+    """Extract the schedule from an image and analyze it in a single API call"""
     payload = {
-        "model": "claude-3-haiku-20240307",
-        "max_tokens": 1024,
+        "model": MODEL,
+        # A week of rows plus a short summary fits well under this
+        "max_tokens": 768,
         "messages": [
             {
                 "role": "user",
                 "content": [
                     {
                         "type": "text",
-                        "text": """Please analyze this employee schedule image and return a JSON object with the following structure:
+                        "text": """Please analyze this employee schedule image and provide:
+1. The employee name and every scheduled day, extracting the exact times as shown in the image without modifying the format
+2. A one or two sentence summary of the schedule (do not calculate the total hours)
+
+Return your response as a JSON object with the following structure:
 {
     "employee_name": "string",
     "schedule": [
@@ -50,9 +129,10 @@ def extract_schedule_data(image_bytes):
             "location": "string",
             "hours": "string"
         }
-    ]
+    ],
+    "summary": "string describing the schedule"
 }
-Extract the exact times as shown in the image without modifying the format."""
+Return ONLY the JSON object, with no other text."""
                     },
                     {
                         "type": "image",
@@ -63,165 +143,223 @@ Extract the exact times as shown in the image without modifying the format."""
                         }
                     }
                 ]
+            },
+            {
+                # Prefill the reply so the model emits the JSON object directly
+                "role": "assistant",
+                "content": "{"
             }
         ]
     }
     
     try:
-        response = requests.post(API_URL, headers=headers, json=payload)
-        response.raise_for_status()  # Raise an error for bad status codes
+        async with session.post(API_URL, json=payload) as response:
+            response.raise_for_status()  # Raise an error for bad status codes
+            response_data = await response.json(loads=orjson.loads)
         
-        response_data = response.json()
         if 'content' not in response_data or not response_data['content']:
-            st.error("❌ No content in API response")
+            output.error("❌ No content in API response")
             return None
-            
-        content = response_data['content'][0]['text']
-        # Find the JSON object in the response
-        try:
-            start = content.find('{')
-            end = content.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = content[start:end]
-                return json.loads(json_str)
-            else:
-                st.error("❌ Could not find JSON in response")
-                return None
-        except Exception as e:
-            st.error(f"❌ Error parsing JSON: {str(e)}")
+        if response_data.get('stop_reason') == 'max_tokens':
+            output.error("❌ API response was cut off before the schedule was complete")
             return None
             
-    except requests.exceptions.RequestException as e:
-        st.error(f"❌ API request failed: {str(e)}")
+        # The reply continues the prefilled "{"
+        return parse_json_response("{" + response_data['content'][0]['text'], output)
+            
+    except aiohttp.ClientError as e:
+        output.error(f"❌ API request failed: {str(e)}")
         return None
     except Exception as e:
-        st.error(f"❌ Unexpected error: {str(e)}")
+        output.error(f"❌ Unexpected error: {str(e)}")
         return None
 
-def analyze_schedule(schedule_data):
-    """Second step: Use Haiku to analyze the schedule and provide a summary"""
-    headers = {
-        'anthropic-version': '2023-06-01',
-        'content-type': 'application/json',
-        'x-api-key': API_KEY
-    }
-    
-    schedule_json = json.dumps(schedule_data, indent=2)
-    
-    payload = {
-        "model": "claude-3-haiku-20240307",
-        "max_tokens": 1024,
-        "messages": [
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"""Given this schedule data:
-{schedule_json}
-
-Please analyze the schedule and provide:
-1. Calculate the total hours worked for the week
-2. Write a brief summary of the schedule
+def to_minutes(hour, minute, meridiem):
+    """Convert a clock time to minutes after midnight"""
+    hour = int(hour)
+    if meridiem:
+        hour = hour % 12 + (12 if meridiem.lower() == 'p' else 0)
+    return hour * 60 + int(minute or 0)
 
-Return your response as a JSON object with this structure:
-{{
-    "total_hours": number,
-    "summary": "string describing the schedule"
-}}"""
-                    }
-                ]
-            }
-        ]
-    }
-    
-    try:
-        response = requests.post(API_URL, headers=headers, json=payload)
-        response.raise_for_status()
-        
-        response_data = response.json()
-        if 'content' not in response_data or not response_data['content']:
-            st.error("❌ No content in API response")
-            return None
-            
-        content = response_data['content'][0]['text']
-        # Find the JSON object in the response
-        try:
-            start = content.find('{')
-            end = content.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = content[start:end]
-                return json.loads(json_str)
-            else:
-                st.error("❌ Could not find JSON in response")
-                return None
-        except Exception as e:
-            st.error(f"❌ Error parsing JSON: {str(e)}")
-            return None
+def compute_total_hours(schedule):
+    """Sum the shift lengths in the schedule's hours strings"""
+    total_minutes = 0
+    for entry in schedule:
+        # Days off have no time range and add nothing; split shifts add each range
+        for match in HOURS_RANGE_PATTERN.finditer(str(entry.get('hours') or '')):
+            start_hour, start_minute, start_meridiem, end_hour, end_minute, end_meridiem = match.groups()
+            end = to_minutes(end_hour, end_minute, end_meridiem)
+            start = to_minutes(start_hour, start_minute, start_meridiem or end_meridiem)
+            if not start_meridiem and end_meridiem and start >= end:
+                # "9-5pm" starts in the morning, "11-7am" the night before
+                other = 'a' if end_meridiem.lower() == 'p' else 'p'
+                start = to_minutes(start_hour, start_minute, other)
             
-    except requests.exceptions.RequestException as e:
-        st.error(f"❌ API request failed: {str(e)}")
-        return None
-    except Exception as e:
-        st.error(f"❌ Unexpected error: {str(e)}")
-        return None
+            # Shifts ending at or before their start run past noon or midnight;
+            # an end time without am/pm ("9am-5") could be either, so try noon first
+            step = 24 * 60 if end_meridiem else 12 * 60
+            while end <= start:
+                end += step
+            total_minutes += end - start
+    return round(total_minutes / 60, 2)
+
+def get_cache_key(image_bytes):
+    """Hash the image together with the model and prompt version"""
+    digest = hashlib.sha256()
+    for part in (MODEL.encode(), PROMPT_VERSION.encode(), image_bytes):
+        # Length-prefix each part so different inputs can't collide
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
 
-def create_schedule_table(data):
-    """Create a pandas DataFrame from the schedule data"""
-    if not data or 'schedule' not in data:
+async def load_cached_response(cache_key):
+    """Return a previously stored API response, or None on a miss"""
+    file_path = os.path.join(LLM_CACHE_DIR, f"{cache_key}.json")
+    if not os.path.exists(file_path):
         return None
     
     try:
-        df = pd.DataFrame(data['schedule'])
-        return df
-    except Exception as e:
-        st.error(f"❌ Error creating table: {str(e)}")
-        return None
+        async with aiofiles.open(file_path, 'rb') as f:
+            data = orjson.loads(await f.read())
+        if isinstance(data, dict) and 'employee_name' in data and 'schedule' in data:
+            return data
+    except Exception:
+        pass
+    
+    # Evict entries that are unreadable or don't match the expected schema
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+    return None
+
+async def save_cached_response(cache_key, data):
+    """Store an API response so identical uploads skip the API call"""
+    try:
+        os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+        async with aiofiles.open(os.path.join(LLM_CACHE_DIR, f"{cache_key}.json"), 'wb') as f:
+            await f.write(orjson.dumps(data))
+    except Exception:
+        pass
 
 def get_week_dates(schedule_data):
     """Extract the dates from the schedule to identify the week"""
     if not schedule_data or 'schedule' not in schedule_data:
         return None
     
-    days = [entry['day'].lower() for entry in schedule_data['schedule']]
-    # Check if we have a full week of data
-    weekdays = {'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'}
-    schedule_days = {day.lower() for day in days}
+    matching_days = {entry['day'].lower() for entry in schedule_data['schedule']} & WEEKDAYS
     
     # If we have at least 5 matching weekdays, consider it the same week
-    matching_days = schedule_days.intersection(weekdays)
     if len(matching_days) >= 5:
-        return sorted(list(matching_days))
+        return tuple(sorted(matching_days))
     return None
 
-def check_existing_schedule(employee_name, week_dates):
+def get_folder_name(employee_name):
+    """Create a safe folder name (replace spaces and special characters)"""
+    return NON_ALNUM_PATTERN.sub("_", employee_name.lower())
+
+def get_week_key(week_dates):
+    """Canonical key identifying a week by its sorted weekdays"""
+    return ",".join(week_dates)
+
+async def read_saved_week_key(file_path):
+    """Read a saved schedule file and return its week key, or None"""
+    try:
+        async with aiofiles.open(file_path, 'rb') as f:
+            data = orjson.loads(await f.read())
+        week_dates = get_week_dates(data.get('raw_schedule'))
+    except Exception:
+        return None
+    return get_week_key(week_dates) if week_dates else None
+
+async def open_schedule_index():
+    """Open the week index, creating and backfilling it on first use"""
+    os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+    is_new = not os.path.exists(INDEX_PATH)
+    
+    conn = sqlite3.connect(INDEX_PATH)
+    with conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS weeks("
+            "employee TEXT, week_key TEXT, path TEXT, PRIMARY KEY(employee, week_key))"
+        )
+    
+    if is_new:
+        # Index schedules that were saved before the index existed
+        import glob
+        schedules_dir = os.path.dirname(INDEX_PATH)
+        file_paths = glob.glob(os.path.join(schedules_dir, "*", "*.json"))
+        week_keys = await asyncio.gather(*(read_saved_week_key(p) for p in file_paths))
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO weeks VALUES (?, ?, ?)",
+                [
+                    (os.path.basename(os.path.dirname(file_path)), week_key,
+                     os.path.relpath(file_path, os.getcwd()))
+                    for file_path, week_key in zip(file_paths, week_keys)
+                    if week_key
+                ]
+            )
+    return conn
+
+async def load_week_index():
+    """Load all indexed weeks into memory as {folder name: {week key: saved path}}"""
+    weeks = defaultdict(dict)
+    try:
+        with closing(await open_schedule_index()) as conn:
+            for employee, week_key, path in conn.execute("SELECT employee, week_key, path FROM weeks"):
+                weeks[employee][week_key] = path
+    except sqlite3.Error as e:
+        st.error(f"❌ Error reading schedule index: {str(e)}")
+        return None
+    return weeks
+
+async def check_existing_schedule(employee_name, week_dates):
     """Check if a schedule for this week already exists"""
     if not employee_name or not week_dates:
         return False
-        
-    # Create safe folder name
-    folder_name = "".join(c if c.isalnum() else "_" for c in employee_name.lower())
-    folder_path = os.path.join(os.getcwd(), "schedules", folder_name)
     
-    # If folder doesn't exist, no duplicates
-    if not os.path.exists(folder_path):
-        return False
+    folder_name = get_folder_name(employee_name)
+    week_key = get_week_key(week_dates)
+    weeks = st.session_state['weeks'][folder_name]
+    path = weeks.get(week_key)
+    if path is None:
+        # Another session may have saved this week since the index was loaded
+        with closing(await open_schedule_index()) as conn:
+            row = conn.execute(
+                "SELECT path FROM weeks WHERE employee = ? AND week_key = ?",
+                (folder_name, week_key)
+            ).fetchone()
+        if row is None:
+            return False
+        path = row[0]
     
-    # Check all JSON files in the folder
-    for file_path in glob.glob(os.path.join(folder_path, "*.json")):
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                if 'raw_schedule' in data:
-                    existing_dates = get_week_dates(data['raw_schedule'])
-                    if existing_dates and set(existing_dates) == set(week_dates):
-                        return True
-        except Exception:
-            continue
+    if os.path.exists(path):
+        weeks[week_key] = path
+        return True
     
+    # The saved file was deleted (e.g. by an administrator to allow a re-upload)
+    weeks.pop(week_key, None)
     return False
 
-def save_to_json(raw_data, analysis):
+def claim_week(conn, folder_name, week_key, path):
+    """Record a saved week in the index, or return False if it is already taken"""
+    try:
+        conn.execute("INSERT INTO weeks VALUES (?, ?, ?)", (folder_name, week_key, path))
+    except sqlite3.IntegrityError:
+        (existing_path,) = conn.execute(
+            "SELECT path FROM weeks WHERE employee = ? AND week_key = ?",
+            (folder_name, week_key)
+        ).fetchone()
+        if os.path.exists(existing_path):
+            return False
+        conn.execute(
+            "UPDATE weeks SET path = ? WHERE employee = ? AND week_key = ?",
+            (path, folder_name, week_key)
+        )
+    return True
+
+async def save_to_json(raw_data, analysis):
     """Save both raw data and analysis to JSON file in user-specific folder"""
     if not raw_data or not analysis:
         return None
@@ -233,8 +371,7 @@ def save_to_json(raw_data, analysis):
             st.error("❌ Employee name not found in schedule data")
             return None
             
-        # Create a safe folder name (replace spaces and special characters)
-        folder_name = "".join(c if c.isalnum() else "_" for c in employee_name.lower())
+        folder_name = get_folder_name(employee_name)
         folder_path = os.path.join(os.getcwd(), "schedules", folder_name)
         
         # Create folders if they don't exist
@@ -251,68 +388,169 @@ def save_to_json(raw_data, analysis):
             "processed_at": timestamp
         }
         
-        with open(file_path, 'w') as f:
-            json.dump(output_data, f, indent=4)
+        async with aiofiles.open(file_path, 'wb') as f:
+            await f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
+        
+        relative_path = os.path.relpath(file_path, os.getcwd())
+        
+        # Record the week in the index used for duplicate checks. The file is written
+        # first so a concurrent save of the same week sees it and backs off.
+        week_dates = get_week_dates(raw_data)
+        if week_dates:
+            week_key = get_week_key(week_dates)
+            with closing(await open_schedule_index()) as conn, conn:
+                claimed = claim_week(conn, folder_name, week_key, relative_path)
+            if not claimed:
+                os.remove(file_path)
+                st.error("❌ A schedule for this week has already been processed!")
+                return None
+            st.session_state['weeks'][folder_name][week_key] = relative_path
             
         # Return relative path for display
-        return os.path.relpath(file_path, os.getcwd())
+        return relative_path
     except Exception as e:
         st.error(f"❌ Error saving data: {str(e)}")
         return None
 
+async def process_schedule(session, image_bytes, cache_key, output, use_cache=True):
+    """Process a single image, splitting the response into schedule and analysis"""
+    # Errors go to the image's own section since images finish in any order
+    try:
+        data = await load_cached_response(cache_key) if use_cache else None
+        if data is None:
+            try:
+                encoded_image = encode_image(cache_key, image_bytes)
+            except Exception as e:
+                output.error(f"❌ Error reading image: {str(e)}")
+                return None, None
+            
+            data = await extract_schedule_data(session, encoded_image, output)
+            if not data:
+                return None, None
+            # Only failed images are kept encoded for a retry
+            st.session_state.pop(f"b64_{cache_key}", None)
+            if use_cache:
+                await save_cached_response(cache_key, data)
+        
+        schedule_data = {
+            "employee_name": data.get('employee_name', ''),
+            "schedule": data.get('schedule', [])
+        }
+        # Hours are summed locally so the model can't miscalculate them
+        analysis = {
+            "total_hours": compute_total_hours(schedule_data['schedule']),
+            "summary": data.get('summary') or ''
+        }
+        return schedule_data, analysis
+    except Exception as e:
+        output.error(f"❌ Unexpected error: {str(e)}")
+        return None, None
+
+async def process_schedules(files, outputs, use_cache=True):
+    """Process all uploaded images concurrently over a shared connection pool"""
+    images = [f.getvalue() for f in files]
+    cache_keys = [get_cache_key(image_bytes) for image_bytes in images]
+    
+    # Only keep encoded images for retries of the current uploads
+    current = {f"b64_{cache_key}" for cache_key in cache_keys}
+    for state_key in [k for k in st.session_state if str(k).startswith("b64_")]:
+        if state_key not in current:
+            del st.session_state[state_key]
+    
+    # Keep-alive connections are reused across every request in the batch
+    connector = aiohttp.TCPConnector(limit=8, limit_per_host=8, keepalive_timeout=30)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers=API_HEADERS,
+        json_serialize=lambda obj: orjson.dumps(obj).decode()
+    ) as session:
+        return await asyncio.gather(
+            *(process_schedule(session, image_bytes, cache_key, output, use_cache)
+              for image_bytes, cache_key, output in zip(images, cache_keys, outputs))
+        )
+
+async def show_result(schedule_data, analysis):
+    """Display one processed image and save it unless it is a duplicate week"""
+    if not schedule_data:
+        st.error("❌ Failed to process the image. Please try again.")
+        return
+    
+    # Check for employee name
+    employee_name = schedule_data.get('employee_name', '').strip()
+    if not employee_name:
+        st.error("❌ Could not find employee name in schedule")
+        return
+    
+    # Check for duplicate week
+    week_dates = get_week_dates(schedule_data)
+    if week_dates and await check_existing_schedule(employee_name, week_dates):
+        st.error("❌ A schedule for this week has already been processed!")
+        st.warning("If you need to update this week's schedule, please contact your administrator.")
+        return
+    
+    # Display table
+    st.subheader("Schedule Table")
+    st.table(schedule_data['schedule'])
+    
+    # Display total hours
+    st.markdown(
+        f"<h2 style='text-align: center;'>Total Hours Worked: "
+        f"<span style='color: #1f77b4;'>{analysis['total_hours']}</span> hrs</h2>",
+        unsafe_allow_html=True
+    )
+    # Display summary
+    if analysis['summary']:
+        st.markdown(f"**Schedule Summary:**\n{analysis['summary']}")
+    else:
+        st.warning("⚠️ No schedule summary was returned for this image")
+    
+    # Save data
+    saved_path = await save_to_json(schedule_data, analysis)
+    if saved_path:
+        st.success(f"✅ Data saved to: {saved_path}")
+
+async def main(files, use_cache=True):
+    """Process the uploaded images, then display and save each result in order"""
+    # Saved weeks are read from disk once per session and kept up to date on save
+    if 'weeks' not in st.session_state:
+        weeks = await load_week_index()
+        if weeks is None:
+            return
+        st.session_state['weeks'] = weeks
+    
+    # Give every image its own section up front, in upload order
+    outputs = []
+    for uploaded_file in files:
+        output = st.container()
+        output.markdown("---")
+        output.subheader(f"📄 {uploaded_file.name}")
+        outputs.append(output)
+    
+    with st.spinner("Processing images..."):
+        results = await process_schedules(files, outputs, use_cache)
+    
+    for output, (schedule_data, analysis) in zip(outputs, results):
+        with output:
+            try:
+                await show_result(schedule_data, analysis)
+            except Exception as e:
+                st.error(f"❌ Unexpected error: {str(e)}")
+
 # Streamlit UI
 st.title("📅 Employee Schedule Scanner")
-st.write("Upload an image of an employee schedule to extract and process the information.")
+st.write("Upload images of employee schedules to extract and process the information.")
 
-uploaded_file = st.file_uploader("Choose an image file", type=['png', 'jpg', 'jpeg'])
+no_cache = st.sidebar.checkbox(
+    "Disable response cache", help="Always send images to the API, even if they were processed before"
+)
 
-if uploaded_file is not None:
-    st.success("✅ Image uploaded successfully!")
+uploaded_files = st.file_uploader(
+    "Choose image files", type=['png', 'jpg', 'jpeg'], accept_multiple_files=True
+)
+
+if uploaded_files:
+    st.success(f"✅ {len(uploaded_files)} image(s) uploaded successfully!")
     
     # Process button
-    if st.button("Process Schedule"):
-        with st.spinner("Processing image..."):
-            # Step 1: Extract schedule data
-            image_bytes = uploaded_file.getvalue()
-            schedule_data = extract_schedule_data(image_bytes)
-            
-            if schedule_data:
-                # Check for employee name
-                employee_name = schedule_data.get('employee_name', '').strip()
-                if not employee_name:
-                    st.error("❌ Could not find employee name in schedule")
-                    st.stop()
-                
-                # Check for duplicate week
-                week_dates = get_week_dates(schedule_data)
-                if week_dates and check_existing_schedule(employee_name, week_dates):
-                    st.error("❌ A schedule for this week has already been processed!")
-                    st.warning("If you need to update this week's schedule, please contact your administrator.")
-                    st.stop()
-                
-                # Create and display table
-                df = create_schedule_table(schedule_data)
-                if df is not None:
-                    st.subheader("Schedule Table")
-                    st.table(df)
-                    
-                    # Step 2: Analyze schedule
-                    with st.spinner("Analyzing schedule..."):
-                        analysis = analyze_schedule(schedule_data)
-                        if analysis:
-                            st.markdown("---")
-                            # Display total hours
-                            st.markdown(
-                                f"<h2 style='text-align: center;'>Total Hours Worked: "
-                                f"<span style='color: #1f77b4;'>{analysis['total_hours']}</span> hrs</h2>",
-                                unsafe_allow_html=True
-                            )
-                            # Display summary
-                            st.markdown(f"**Schedule Summary:**\n{analysis['summary']}")
-                            
-                            # Save data
-                            saved_path = save_to_json(schedule_data, analysis)
-                            if saved_path:
-                                st.success(f"✅ Data saved to: {saved_path}")
-            else:
-                st.error("❌ Failed to process the image. Please try again.")
+    if st.button("Process Schedules"):
+        run_async(main(uploaded_files, use_cache=not no_cache))